@@ -1,7 +1,8 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
 import os
-from app.services.audio_service import AudioService
+import uuid
+from app.services.audio_service import MixtapePipeline
 from app.services.video_service import VideoService
 from app.services.description_service import DescriptionService
 
@@ -22,19 +23,30 @@ async def generate(files: list[UploadFile] = File(...)):
 
         file_paths = []
 
-        # Save uploaded files
-        for file in files:
-            path = os.path.join(upload_folder, file.filename)
-            with open(path, "wb") as f:
-                f.write(await file.read())
-            file_paths.append(path)
-            print(f"✅ Saved: {path}")
-
-        # Create mixtape
-        print("🎵 Creating mixtape...")
+        # Start the mixtape pipeline so each track decodes as soon as it is saved
         mixtape_path = os.path.join(os.getcwd(), "mixtape.mp3")
-        mixtape = AudioService.create_mixtape(file_paths, output=mixtape_path)
-        print(f"✅ Mixtape created: {mixtape}")
+        pipeline = MixtapePipeline(output=mixtape_path)
+
+        try:
+            # Save uploaded files
+            for file in files:
+                # Give each upload its own folder so duplicate names never overwrite
+                # a file that is still being decoded, while keeping the original name
+                file_folder = os.path.join(upload_folder, uuid.uuid4().hex)
+                os.makedirs(file_folder)
+                path = os.path.join(file_folder, os.path.basename(file.filename))
+                with open(path, "wb") as f:
+                    f.write(await file.read())
+                file_paths.append(path)
+                print(f"✅ Saved: {path}")
+                pipeline.add_track(path)
+
+            # Finish mixtape
+            print("🎵 Creating mixtape...")
+            mixtape = pipeline.finish()
+            print(f"✅ Mixtape created: {mixtape}")
+        finally:
+            pipeline.close()
 
         # Generate description
         print("📝 Generating description...")
@@ -1,49 +1,53 @@
 from pydub import AudioSegment
+from concurrent.futures import ThreadPoolExecutor
 import os
+import queue
 
 class AudioService:
 
     @staticmethod
-    def create_mixtape(files, output="mixtape.mp3", fade_duration_ms=2000):
+    def load_track(file):
         """
-        Create a smooth fade mixtape by concatenating audio files with crossfades
-        Simple and reliable approach
+        Decode a single audio file and standardize it to 2 channels, 44100 Hz
+        Returns None if the file is missing or cannot be decoded
         """
-        if not files or len(files) == 0:
-            raise ValueError("No audio files provided")
-            
-        songs = []
+        if not os.path.exists(file):
+            print(f"⚠️  Skipping missing file: {file}")
+            return None
+
+        try:
+            print(f"Loading: {file}")
+            song = AudioSegment.from_file(file)
+            # Standardize format to 2 channels, 44100 Hz
+            song = song.set_channels(2).set_frame_rate(44100)
+            print(f"✅ Loaded: {file} ({len(song)}ms)")
+            return song
+        except Exception as e:
+            print(f"❌ Error processing file {file}: {e}")
+            return None
+
+    @staticmethod
+    def mix_tracks(songs, fade_duration_ms=2000):
+        """
+        Fold songs into one mixtape with crossfades, in the order they are yielded
+        Skips None entries (tracks that failed to load)
+        """
+        mixtape = None
 
-        # Load all valid audio files
-        for file in files:
-            if not os.path.exists(file):
-                print(f"⚠️  Skipping missing file: {file}")
+        for song in songs:
+            if song is None:
                 continue
-                
-            try:
-                print(f"Loading: {file}")
-                song = AudioSegment.from_file(file)
-                # Standardize format to 2 channels, 44100 Hz
-                song = song.set_channels(2).set_frame_rate(44100)
-                songs.append(song)
-                print(f"✅ Loaded: {file} ({len(song)}ms)")
-            except Exception as e:
-                print(f"❌ Error processing file {file}: {e}")
+
+            # Start with first song
+            if mixtape is None:
+                mixtape = song
                 continue
 
-        if not songs:
-            raise ValueError("No valid audio files could be processed")
-        
-        # Start with first song
-        mixtape = songs[0]
-        
-        # Add remaining songs with crossfade
-        for song in songs[1:]:
             try:
                 # Crossfade between current mixtape and next song
                 # Use min to ensure fade duration doesn't exceed song length
                 fade_ms = min(fade_duration_ms, len(mixtape), len(song))
-                
+
                 # Use fast builtin crossfade (simpler than low-pass filter approach)
                 mixtape = mixtape.append(song, crossfade=fade_ms)
                 print(f"✅ Added song with {fade_ms}ms crossfade")
@@ -51,10 +55,83 @@ class AudioService:
                 print(f"⚠️  Error during crossfade, appending without fade: {e}")
                 # Fallback: just append without crossfade
                 mixtape = mixtape + song
-        
-        # Export the final mixtape
+
+        if mixtape is None:
+            raise ValueError("No valid audio files could be processed")
+
+        return mixtape
+
+    @staticmethod
+    def export_mixtape(mixtape, output="mixtape.mp3"):
+        """Export the final mixtape as MP3"""
         print(f"💾 Exporting mixtape to {output}...")
         mixtape.export(output, format="mp3", bitrate="192k")
         print(f"✅ Mixtape exported successfully: {output}")
-        
-        return output
\ No newline at end of file
+        return output
+
+    @staticmethod
+    def create_mixtape(files, output="mixtape.mp3", fade_duration_ms=2000):
+        """
+        Create a smooth fade mixtape by concatenating audio files with crossfades
+        Simple and reliable approach
+        """
+        if not files or len(files) == 0:
+            raise ValueError("No audio files provided")
+
+        songs = (AudioService.load_track(file) for file in files)
+        mixtape = AudioService.mix_tracks(songs, fade_duration_ms)
+        return AudioService.export_mixtape(mixtape, output)
+
+
+class MixtapePipeline:
+    """
+    Staged mixtape builder that overlaps saving, decoding and mixing
+
+    Each track is decoded on a worker as soon as add_track() is called,
+    while a mixer thread folds decoded tracks into the mixtape in track order.
+    Call finish() once every track has been added to export the result.
+    """
+
+    _DONE = object()
+
+    def __init__(self, output="mixtape.mp3", fade_duration_ms=2000, max_workers=None):
+        self.output = output
+        self.fade_duration_ms = fade_duration_ms
+        self._decoders = ThreadPoolExecutor(max_workers=max_workers)
+        self._mixer = ThreadPoolExecutor(max_workers=1)
+        self._pending = queue.Queue()
+        self._track_count = 0
+        self._mix_future = self._mixer.submit(self._mix)
+
+    def add_track(self, file):
+        """Start decoding a saved file; it is mixed once all earlier tracks are in"""
+        self._pending.put(self._decoders.submit(AudioService.load_track, file))
+        self._track_count += 1
+
+    def _decoded_tracks(self):
+        # Yield decoded tracks in submission order, waiting on each in turn
+        while True:
+            future = self._pending.get()
+            if future is self._DONE:
+                return
+            yield future.result()
+
+    def _mix(self):
+        return AudioService.mix_tracks(self._decoded_tracks(), self.fade_duration_ms)
+
+    def finish(self):
+        """Wait for all tracks to be mixed, export the mixtape and return its path"""
+        self._pending.put(self._DONE)
+        try:
+            if self._track_count == 0:
+                raise ValueError("No audio files provided")
+            mixtape = self._mix_future.result()
+            return AudioService.export_mixtape(mixtape, self.output)
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the workers; safe to call more than once"""
+        self._pending.put(self._DONE)
+        self._decoders.shutdown(wait=False, cancel_futures=True)
+        self._mixer.shutdown(wait=False)
\ No newline at end of file